@@ -3,18 +3,26 @@ from modules import modules
 from modules.config import Config
 from modules.ai_provider import HomeworkAI
 from modules.session_manager import SessionManager
+from modules.admission import AdmissionController, AdmissionRejected, FOLLOW_UP, NEW_SESSION
+from modules.request_capture import RequestCapture
 from modules.rate_limiter import limiter
+from datetime import datetime, timezone
 from uuid import uuid4
+import atexit
+import time
 import structlog
 
 logger = structlog.get_logger(__name__)
 
-def configure_routes(app):
-    config = Config()
+def configure_routes(app, config: Config = None):
+    config = config or Config()
     config.validate()
 
     session_manager = SessionManager(config)
     homework_ai = HomeworkAI(config, session_manager)
+    atexit.register(homework_ai.close)
+    admission = AdmissionController(config)
+    capture = RequestCapture(config.request_capture_path)
 
     @app.route("/")
     def index():
@@ -26,13 +34,18 @@ def configure_routes(app):
     def health_check():
         return jsonify({
             'status': 'healthy',
+            'upstream_pool': homework_ai.pool_stats(),
+            'admission': admission.stats(),
             'request_id': str(uuid4())
         })
 
     @app.route("/api/generate_answer", methods=["POST"])
-    @limiter.limit("50/hour")
+    # Shed requests are not charged so clients honouring Retry-After keep their quota.
+    @limiter.limit("50/hour", deduct_when=lambda response: response.status_code != 503)
     def generate_answer():
         request_id = str(uuid4())
+        arrived_at = datetime.now(timezone.utc)
+        start = time.monotonic()
         logger.info("Processing generate_answer request", request_id=request_id)
 
         data = request.get_json(silent=True)
@@ -53,12 +66,27 @@ def configure_routes(app):
                 'request_id': request_id
             }, 400
 
-        if not session_id or not session_manager.session_exists(session_id):
-            session_id = homework_ai.start_session()
-            logger.info("Created new session", session_id=session_id, request_id=request_id)
+        is_follow_up = bool(session_id) and session_manager.session_exists(session_id)
+        try:
+            with admission.admit(FOLLOW_UP if is_follow_up else NEW_SESSION) as slot:
+                if not is_follow_up:
+                    session_id = homework_ai.start_session()
+                    logger.info("Created new session", session_id=session_id, request_id=request_id)
+
+                response, slot.failed = homework_ai.generate_response(session_id, question)
+        except AdmissionRejected as e:
+            logger.warning("Shed generate_answer request", request_id=request_id,
+                           reason=e.reason, retry_after=e.retry_after)
+            capture.record(arrived_at, session_id if is_follow_up else None, question, 503,
+                           (time.monotonic() - start) * 1000, error=True)
+            return {
+                'error': 'Server is busy, please try again later',
+                'request_id': request_id
+            }, 503, {'Retry-After': str(e.retry_after)}
 
-        response = homework_ai.generate_response(session_id, question)
         logger.info("message sent by AI", response=response, request_id=request_id)
+        capture.record(arrived_at, session_id, question, 200, (time.monotonic() - start) * 1000,
+                       error=response.get('question_type') == 'Error')
         return response
 
     @app.route("/api/chat_history/<string:session_id>", methods=["GET"])
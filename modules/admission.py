@@ -0,0 +1,163 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+from .config import Config
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+FOLLOW_UP = 0
+NEW_SESSION = 1
+
+PRIORITY_NAMES = {FOLLOW_UP: 'follow_up', NEW_SESSION: 'new_session'}
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Request shed: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class _Ticket:
+    def __init__(self):
+        self.displaced = False
+
+class _Slot:
+    def __init__(self):
+        self.failed = False
+
+class AdmissionController:
+    """Adaptive concurrency limit with a bounded priority queue.
+
+    The limit follows AIMD: every on-target completion adds ``1 / limit``
+    and a slow or failed one multiplies it by ``decrease_factor``, at most
+    once per observed latency so a single slow burst only counts once.
+    Lower priority values are admitted first.
+    """
+
+    def __init__(self, config: Config, decrease_factor: float = 0.75):
+        self.max_queue = config.admission_max_queue
+        self.queue_timeout = config.admission_queue_timeout
+        self.min_limit = config.admission_min_limit
+        self.max_limit = config.admission_max_limit
+        self.latency_target = config.admission_latency_target
+        self.decrease_factor = decrease_factor
+        self._limit = float(min(max(config.admission_initial_limit, self.min_limit), self.max_limit))
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int, _Ticket]] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._latency_ewma = 0.0
+        self._last_decrease = 0.0
+        self._admitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._shed: Dict[str, int] = {'queue_full': 0, 'timeout': 0, 'displaced': 0}
+
+    @contextmanager
+    def admit(self, priority: int) -> Iterator[_Slot]:
+        self._acquire(priority)
+        slot = _Slot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except Exception:
+            slot.failed = True
+            raise
+        finally:
+            self._release(time.monotonic() - start, slot.failed)
+
+    def _acquire(self, priority: int) -> None:
+        with self._cond:
+            if not self._queue and self._in_flight < self._current_limit():
+                self._admit()
+                return
+
+            if len(self._queue) >= self.max_queue:
+                victim = max(self._queue, default=None)
+                if victim is None or victim[0] <= priority:
+                    raise self._reject('queue_full')
+                self._remove(victim)
+                victim[2].displaced = True
+                self._cond.notify_all()
+
+            entry = (priority, next(self._seq), _Ticket())
+            heapq.heappush(self._queue, entry)
+            deadline = time.monotonic() + self.queue_timeout
+            while True:
+                ticket = entry[2]
+                if ticket.displaced:
+                    raise self._reject('displaced')
+                if self._queue[0] is entry and self._in_flight < self._current_limit():
+                    heapq.heappop(self._queue)
+                    self._admit()
+                    self._cond.notify_all()
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._remove(entry)
+                    self._cond.notify_all()
+                    raise self._reject('timeout')
+                self._cond.wait(remaining)
+
+    def _release(self, latency: float, failed: bool) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._completed += 1
+            if failed:
+                self._failed += 1
+            self._latency_ewma = latency if self._completed == 1 else 0.8 * self._latency_ewma + 0.2 * latency
+
+            now = time.monotonic()
+            if failed or latency > self.latency_target:
+                if now - self._last_decrease >= self._latency_ewma:
+                    self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                    self._last_decrease = now
+                    logger.info("Decreased admission limit", limit=round(self._limit, 2),
+                                latency_ms=round(latency * 1000), failed=failed)
+            else:
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    def _current_limit(self) -> int:
+        return max(self.min_limit, math.floor(self._limit))
+
+    def _admit(self) -> None:
+        self._in_flight += 1
+        self._admitted += 1
+
+    def _remove(self, entry: Tuple[int, int, _Ticket]) -> None:
+        self._queue.remove(entry)
+        heapq.heapify(self._queue)
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self._shed[reason] += 1
+        return AdmissionRejected(reason, self._retry_after())
+
+    def _retry_after(self) -> int:
+        # Roughly how long it takes to drain the current backlog.
+        backlog = len(self._queue) + self._in_flight
+        estimate = self._latency_ewma * backlog / self._current_limit()
+        return min(60, max(1, math.ceil(estimate)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _, _ in self._queue:
+                queued[PRIORITY_NAMES[priority]] += 1
+            return {
+                'limit': round(self._limit, 2),
+                'in_flight': self._in_flight,
+                'queue_depth': len(self._queue),
+                'queued': queued,
+                'max_queue': self.max_queue,
+                'admitted': self._admitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'shed': sum(self._shed.values()),
+                'shed_by_reason': dict(self._shed),
+                'latency_ewma_ms': round(self._latency_ewma * 1000, 1)
+            }
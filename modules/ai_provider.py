@@ -1,21 +1,78 @@
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from uuid import uuid4
+import google.ai.generativelanguage as glm
 import google.generativeai as genai
 from .config import Config
 from .session_manager import SessionManager
+from .client_pool import ClientPool, PoolTimeout
+from .fake_provider import FakeGenerativeModel
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+MODEL_NAME = 'gemini-2.0-flash'
+
 class HomeworkAI:
     def __init__(self, config: Config, session_manager: SessionManager):
         self.config = config
         self.session_manager = session_manager
-        genai.configure(api_key=config.google_api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        if config.ai_provider == 'fake':
+            factory, closer = self._build_fake_model, None
+        else:
+            genai.configure(api_key=config.google_api_key)
+            factory, closer = self._build_model, self._close_model
+        self.client_pool = ClientPool(
+            factory,
+            size=config.upstream_pool_size,
+            timeout=config.upstream_pool_timeout,
+            closer=closer
+        )
         self.system_prompt = self._load_system_prompt()
-        logger.info("HomeworkAI initialized successfully")
+        logger.info("HomeworkAI initialized successfully", provider=config.ai_provider,
+                    transport=config.upstream_transport, pool_size=config.upstream_pool_size)
+
+    def _build_fake_model(self) -> FakeGenerativeModel:
+        return FakeGenerativeModel(self.config.fake_provider_latency_ms)
+
+    def _build_model(self) -> genai.GenerativeModel:
+        transport_cls = glm.GenerativeServiceClient.get_transport_class(self.config.upstream_transport)
+        keepalive_options = [
+            ("grpc.keepalive_time_ms", self.config.upstream_keepalive_ms),
+            ("grpc.keepalive_timeout_ms", 10000),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0)
+        ]
+
+        def create_channel(host, options=(), **kwargs):
+            return transport_cls.create_channel(host, options=list(options) + keepalive_options, **kwargs)
+
+        def create_transport(**kwargs):
+            if self.config.upstream_transport == 'rest':
+                # The REST transport keeps its requests session, and with it
+                # the HTTP connection, alive for the lifetime of the client.
+                return transport_cls(url_scheme=self.config.upstream_url_scheme, **kwargs)
+            return transport_cls(channel=create_channel, **kwargs)
+
+        client_options = {'api_key': self.config.google_api_key}
+        if self.config.upstream_endpoint:
+            client_options['api_endpoint'] = self.config.upstream_endpoint
+        client = glm.GenerativeServiceClient(transport=create_transport, client_options=client_options)
+
+        model = genai.GenerativeModel(MODEL_NAME)
+        # GenerativeModel has no public hook for a per-instance client, so bind
+        # the dedicated one directly instead of the SDK's process-wide default.
+        model._client = client
+        return model
+
+    def _close_model(self, model: genai.GenerativeModel) -> None:
+        model._client.transport.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self.client_pool.stats()
+
+    def close(self) -> None:
+        self.client_pool.close()
 
     def _load_system_prompt(self) -> str:
         return """
@@ -414,13 +471,14 @@ Explain again
         logger.info("Started new session", session_id=session_id)
         return session_id
 
-    def generate_response(self, session_id: str, question: str) -> Dict[str, Any]:
+    def generate_response(self, session_id: str, question: str) -> Tuple[Dict[str, Any], bool]:
+        """Returns the answer payload and whether the upstream failed or was saturated."""
         request_id = str(uuid4())
         logger.info("Processing question", request_id=request_id, session_id=session_id, question=question[:50])
 
         if not self.session_manager.session_exists(session_id):
             logger.warning("Invalid session ID", request_id=request_id, session_id=session_id)
-            return self._error_response("Invalid session ID", request_id, session_id)
+            return self._error_response("Invalid session ID", request_id, session_id), False
 
         if not question or not isinstance(question, str):
             logger.warning("Invalid question provided", request_id=request_id, session_id=session_id)
@@ -428,7 +486,7 @@ Explain again
             return self._error_response("No question provided", request_id, session_id, steps=[
                 "It seems no question was provided.",
                 "Please provide a valid homework question."
-            ])
+            ]), False
 
         self.session_manager.add_message(session_id, "user", question)
 
@@ -461,31 +519,39 @@ Explain again
         )
 
         try:
-            response = self.model.generate_content(
-              conversation,
-              generation_config=generation_config
-            )
+            with self.client_pool.acquire() as model:
+                response = model.generate_content(
+                  conversation,
+                  generation_config=generation_config
+                )
             print(response)
             response_json = json.loads(response.text.strip())
             self.session_manager.add_message(session_id, "assistant", response.text.strip())
             response_json["request_id"] = request_id
             response_json["session_id"] = session_id
             logger.info("Generated response successfully", request_id=request_id, session_id=session_id)
-            return response_json
+            return response_json, False
+        except PoolTimeout as e:
+            logger.error("No upstream client available", request_id=request_id, session_id=session_id, error=str(e))
+            self.session_manager.add_message(session_id, "assistant", "Error: Upstream busy")
+            return self._error_response("Upstream busy", request_id, session_id, steps=[
+                "The assistant is handling a lot of questions right now.",
+                "Please try again in a moment."
+            ]), True
         except json.JSONDecodeError as e:
             logger.error("Failed to parse JSON response", request_id=request_id, session_id=session_id, error=str(e))
             self.session_manager.add_message(session_id, "assistant", "Error: Failed to parse response")
             return self._error_response("Failed to parse response", request_id, session_id, steps=[
                 "There was an issue processing the response.",
                 "Please try again or rephrase your question."
-            ])
+            ]), False
         except Exception as e:
             logger.error("Gemini API error", request_id=request_id, session_id=session_id, error=str(e))
             self.session_manager.add_message(session_id, "assistant", "Error: API failure")
             return self._error_response("API failure", request_id, session_id, steps=[
                 "Something went wrong while processing your question.",
                 "Please try again later."
-            ])
+            ]), True
 
     def _error_response(self, message: str, request_id: str, session_id: str, steps: List[str] = None) -> Dict[str, Any]:
         return {
@@ -0,0 +1,134 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+class PoolTimeout(Exception):
+    pass
+
+class ClientPool:
+    """Bounded, thread-safe pool of upstream clients.
+
+    Clients are created lazily by ``factory`` up to ``size`` and handed back
+    out most-recently-used first, so the connections that are already warm
+    are the ones that get reused.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int, timeout: float,
+                 closer: Optional[Callable[[Any], None]] = None):
+        if size < 1:
+            raise ValueError("Client pool size must be at least 1")
+        self.factory = factory
+        self.closer = closer
+        self.size = size
+        self.timeout = timeout
+        self._idle: List[Any] = []
+        self._open = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._acquisitions = 0
+        self._reuses = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        client = self._checkout()
+        try:
+            yield client
+        finally:
+            self._checkin(client)
+
+    def _checkout(self) -> Any:
+        start = time.monotonic()
+        deadline = start + self.timeout
+        create = False
+        with self._cond:
+            waited = False
+            while self._closed or (not self._idle and self._open >= self.size):
+                if self._closed:
+                    raise PoolTimeout("Client pool is closed")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    logger.warning("Timed out waiting for upstream client", pool_size=self.size)
+                    raise PoolTimeout("Timed out waiting for an upstream client")
+                waited = True
+                self._cond.wait(remaining)
+            if self._idle:
+                client = self._idle.pop()
+                self._reuses += 1
+            else:
+                # Reserve the slot before releasing the lock so concurrent
+                # callers cannot overshoot the pool size.
+                self._open += 1
+                create = True
+            opened = self._open
+            self._record_wait(time.monotonic() - start, waited)
+
+        if create:
+            try:
+                client = self.factory()
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+            logger.info("Opened upstream client", open=opened, pool_size=self.size)
+        return client
+
+    def _checkin(self, client: Any) -> None:
+        with self._cond:
+            if self._closed:
+                self._open -= 1
+            else:
+                self._idle.append(client)
+                self._cond.notify()
+                return
+        self._close_client(client)
+
+    def _record_wait(self, wait: float, waited: bool) -> None:
+        self._acquisitions += 1
+        if waited:
+            self._waits += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            acquisitions = self._acquisitions
+            return {
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+                'acquisitions': acquisitions,
+                'reuses': self._reuses,
+                'reuse_rate': round(self._reuses / acquisitions, 4) if acquisitions else 0.0,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'avg_wait_ms': round(self._total_wait * 1000 / acquisitions, 3) if acquisitions else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3)
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for client in idle:
+            self._close_client(client)
+
+    def _close_client(self, client: Any) -> None:
+        if self.closer is None:
+            return
+        try:
+            self.closer(client)
+        except Exception as e:
+            logger.warning("Failed to close upstream client", error=str(e))
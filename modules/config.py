@@ -10,7 +10,32 @@ class Config:
     allowed_origins: str = os.getenv('ALLOWED_ORIGINS', '*')
     rate_limit: str = os.getenv('RATE_LIMIT', '50/hour')
     max_history_length: int = int(os.getenv('MAX_HISTORY_LENGTH', 5))
+    ai_provider: str = os.getenv('AI_PROVIDER', 'gemini')
+    fake_provider_latency_ms: float = float(os.getenv('FAKE_PROVIDER_LATENCY_MS', 200))
+    # Captures keep timestamps, session ids and the first 50 characters of
+    # each question, the same as the "Processing question" log line.
+    request_capture_path: str = os.getenv('REQUEST_CAPTURE_PATH', '')
+    upstream_transport: str = os.getenv('UPSTREAM_TRANSPORT', 'grpc')
+    upstream_endpoint: str = os.getenv('UPSTREAM_ENDPOINT', '')
+    upstream_url_scheme: str = os.getenv('UPSTREAM_URL_SCHEME', 'https')
+    upstream_pool_size: int = int(os.getenv('UPSTREAM_POOL_SIZE', 4))
+    upstream_pool_timeout: float = float(os.getenv('UPSTREAM_POOL_TIMEOUT', 10))
+    upstream_keepalive_ms: int = int(os.getenv('UPSTREAM_KEEPALIVE_MS', 30000))
+    admission_max_queue: int = int(os.getenv('ADMISSION_MAX_QUEUE', 20))
+    admission_queue_timeout: float = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 5))
+    admission_initial_limit: int = int(os.getenv('ADMISSION_INITIAL_LIMIT', 2))
+    admission_min_limit: int = int(os.getenv('ADMISSION_MIN_LIMIT', 1))
+    admission_max_limit: int = int(os.getenv('ADMISSION_MAX_LIMIT', os.getenv('UPSTREAM_POOL_SIZE', 4)))
+    admission_latency_target: float = float(os.getenv('ADMISSION_LATENCY_TARGET', 8))
 
     def validate(self) -> None:
-        if not self.google_api_key:
-            raise ValueError("Missing required environment variable: GOOGLE_API_KEY")
\ No newline at end of file
+        if self.ai_provider not in ('gemini', 'fake'):
+            raise ValueError("AI_PROVIDER must be one of: gemini, fake")
+        if self.ai_provider == 'gemini' and not self.google_api_key:
+            raise ValueError("Missing required environment variable: GOOGLE_API_KEY")
+        if self.upstream_transport not in ('grpc', 'rest'):
+            raise ValueError("UPSTREAM_TRANSPORT must be one of: grpc, rest")
+        if self.upstream_pool_size < 1:
+            raise ValueError("UPSTREAM_POOL_SIZE must be at least 1")
+        if not 1 <= self.admission_min_limit <= self.admission_max_limit:
+            raise ValueError("ADMISSION_MIN_LIMIT must be at least 1 and no greater than ADMISSION_MAX_LIMIT")
\ No newline at end of file
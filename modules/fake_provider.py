@@ -0,0 +1,32 @@
+import json
+import random
+import time
+from typing import Any
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """Stand-in for ``genai.GenerativeModel`` that answers locally.
+
+    Used for load tests and replays so traffic never reaches Gemini. Each
+    call sleeps for ``latency_ms`` scaled by a random jitter factor.
+    """
+
+    def __init__(self, latency_ms: float, jitter: float = 0.25):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+
+    def generate_content(self, contents: Any, generation_config: Any = None) -> FakeResponse:
+        factor = 1 + random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, self.latency_ms * factor) / 1000)
+        question = contents[-1]["parts"][0]["text"] if contents else ""
+        return FakeResponse(json.dumps({
+            "greeting": "Hi there! This is a practice answer 😊",
+            "question_type": "general",
+            "solution_steps": [f"You asked: {question[:50]}"],
+            "final_answer": "This answer was generated by the fake provider.",
+            "difficulty_level": "Easy",
+            "closing_note": "Keep practicing! 🚀"
+        }))
@@ -28,7 +28,8 @@ def start_session(homework_ai):
 def generate_response(homework_ai, session_manager, session_id, question):
     if not session_manager.session_exists(session_id):
         session_id = homework_ai.start_session()
-    return homework_ai.generate_response(session_id, question), session_id
+    response, _ = homework_ai.generate_response(session_id, question)
+    return response, session_id
 
 def get_chat_history(session_manager, session_id):
     return session_manager.get_all_chats(session_id)
\ No newline at end of file
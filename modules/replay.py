@@ -0,0 +1,281 @@
+import argparse
+import contextlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LATENCY_KEYS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+@dataclass
+class ReplayEvent:
+    offset: float
+    session_key: str
+    question: str
+
+@dataclass
+class ReplayResult:
+    session_key: str
+    scheduled: float
+    started: float
+    latency: float
+    status: int
+    error: bool
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def load_events(path: str) -> List[ReplayEvent]:
+    """Reads replayable requests from ``homework_ai.log`` or a request capture.
+
+    Log lines are the structlog JSON records written by the app; only
+    "Processing question" events are replayed, and their questions are the
+    logged 50 character prefixes. Capture files hold one record per request,
+    with questions truncated the same way.
+    Anything that is not a JSON object, such as werkzeug output, is skipped.
+    """
+    records: List[Tuple[datetime, str, str]] = []
+    with open(path, encoding='utf-8') as f:
+        for index, line in enumerate(f):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict) or 'timestamp' not in record or not record.get('question'):
+                continue
+            if 'event' in record and record['event'] != "Processing question":
+                continue
+            session_key = record.get('session_id') or f"anonymous-{index}"
+            records.append((_parse_timestamp(record['timestamp']), session_key, record['question']))
+
+    records.sort(key=lambda r: r[0])
+    if not records:
+        return []
+    first = records[0][0]
+    return [
+        ReplayEvent((timestamp - first).total_seconds(), session_key, question)
+        for timestamp, session_key, question in records
+    ]
+
+def cap_gaps(events: List[ReplayEvent], max_gap: float) -> List[ReplayEvent]:
+    capped: List[ReplayEvent] = []
+    shift = 0.0
+    previous = 0.0
+    for event in events:
+        shift += max(0.0, event.offset - previous - max_gap)
+        previous = event.offset
+        capped.append(ReplayEvent(event.offset - shift, event.session_key, event.question))
+    return capped
+
+def group_sessions(events: List[ReplayEvent]) -> Dict[str, List[ReplayEvent]]:
+    sessions: Dict[str, List[ReplayEvent]] = {}
+    for event in events:
+        sessions.setdefault(event.session_key, []).append(event)
+    return sessions
+
+class InProcessClient:
+    """Posts to the Flask app through its test client.
+
+    Each replayed session gets its own remote address so the per-client rate
+    limit applies per original session rather than to the replay as a whole.
+    """
+
+    def __init__(self, app, index: int):
+        self.client = app.test_client()
+        self.remote_addr = f"10.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+
+    def post(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        response = self.client.post("/api/generate_answer", json=payload,
+                                    environ_base={'REMOTE_ADDR': self.remote_addr})
+        return response.status_code, response.get_json(silent=True) or {}
+
+class HttpClient:
+    def __init__(self, target: str, timeout: float):
+        import requests
+        self.session = requests.Session()
+        self.url = target.rstrip('/') + "/api/generate_answer"
+        self.timeout = timeout
+
+    def post(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        import requests
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        except requests.RequestException:
+            return 0, {}
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, {}
+
+def run_replay(events: List[ReplayEvent], make_client: Callable[[int], Any], speed: float) -> Tuple[List[ReplayResult], float]:
+    """Replays ``events`` keeping their inter-arrival times and sessions.
+
+    Every original session runs on its own thread and sends its questions in
+    order, each no earlier than its original offset divided by ``speed``.
+    Threads are started by a single scheduler loop at their session's first
+    offset, so only sessions that are actually active hold a thread.
+    Follow-ups reuse the session id the app handed out for the first turn.
+    """
+    results: List[ReplayResult] = []
+    lock = threading.Lock()
+    start = time.monotonic()
+
+    def wait_until(scheduled: float) -> None:
+        delay = start + scheduled - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def replay_session(index: int, session_events: List[ReplayEvent]) -> None:
+        client = make_client(index)
+        session_id: Optional[str] = None
+        for event in session_events:
+            scheduled = event.offset / speed
+            wait_until(scheduled)
+            payload = {'question': event.question}
+            if session_id:
+                payload['session_id'] = session_id
+            sent = time.monotonic()
+            status, body = client.post(payload)
+            latency = time.monotonic() - sent
+            session_id = body.get('session_id') or session_id
+            error = status != 200 or body.get('question_type') == 'Error'
+            with lock:
+                results.append(ReplayResult(event.session_key, scheduled, sent - start, latency, status, error))
+
+    sessions = sorted(group_sessions(events).values(), key=lambda session_events: session_events[0].offset)
+    threads: List[threading.Thread] = []
+    for index, session_events in enumerate(sessions):
+        wait_until(session_events[0].offset / speed)
+        threads = [thread for thread in threads if thread.is_alive()]
+        thread = threading.Thread(target=replay_session, args=(index, session_events), daemon=True)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results, time.monotonic() - start
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+def summarize(results: List[ReplayResult], wall_time: float) -> Dict[str, Any]:
+    latencies = [r.latency * 1000 for r in results]
+    lateness = [max(0.0, r.started - r.scheduled) * 1000 for r in results]
+    statuses: Dict[str, int] = {}
+    for r in results:
+        statuses[str(r.status)] = statuses.get(str(r.status), 0) + 1
+    total = len(results)
+    errors = sum(1 for r in results if r.error)
+    return {
+        'requests': total,
+        'sessions': len({r.session_key for r in results}),
+        'wall_time_s': round(wall_time, 3),
+        'throughput_rps': round(total / wall_time, 3) if wall_time > 0 else 0.0,
+        'statuses': statuses,
+        'errors': errors,
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'shed': statuses.get('503', 0),
+        'mean_ms': round(sum(latencies) / total, 3) if total else 0.0,
+        'p50_ms': round(_percentile(latencies, 50), 3),
+        'p90_ms': round(_percentile(latencies, 90), 3),
+        'p95_ms': round(_percentile(latencies, 95), 3),
+        'p99_ms': round(_percentile(latencies, 99), 3),
+        'max_ms': round(max(latencies, default=0.0), 3),
+        'max_send_lag_ms': round(max(lateness, default=0.0), 3)
+    }
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Returns a description of every metric that regressed past ``tolerance``."""
+    regressions = []
+    for key in LATENCY_KEYS:
+        if baseline.get(key) and report[key] > baseline[key] * (1 + tolerance):
+            regressions.append(f"{key} {report[key]} > baseline {baseline[key]}")
+    if baseline.get('throughput_rps') and report['throughput_rps'] < baseline['throughput_rps'] * (1 - tolerance):
+        regressions.append(f"throughput_rps {report['throughput_rps']} < baseline {baseline['throughput_rps']}")
+    if report['error_rate'] > baseline.get('error_rate', 0.0) + 0.01:
+        regressions.append(f"error_rate {report['error_rate']} > baseline {baseline.get('error_rate', 0.0)}")
+    return regressions
+
+def _in_process_client_factory(fake_latency_ms: Optional[float]) -> Callable[[int], InProcessClient]:
+    # Config reads the environment when it is first imported, so the fake
+    # provider has to be selected before the app is loaded.
+    os.environ['AI_PROVIDER'] = 'fake'
+    os.environ['REQUEST_CAPTURE_PATH'] = ''
+    if fake_latency_ms is not None:
+        os.environ['FAKE_PROVIDER_LATENCY_MS'] = str(fake_latency_ms)
+    from app import app
+
+    def make_client(index: int) -> InProcessClient:
+        return InProcessClient(app, index)
+    return make_client
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m modules.replay",
+        description="Replay generate_answer traffic from homework_ai.log or a request capture file."
+    )
+    parser.add_argument("source", help="homework_ai.log or a REQUEST_CAPTURE_PATH JSONL file")
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression factor, 2 replays twice as fast")
+    parser.add_argument("--max-gap", type=float, help="shorten idle gaps between requests to at most this many seconds")
+    parser.add_argument("--target", help="base URL of a running app; defaults to an in-process app on the fake provider")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout with --target")
+    parser.add_argument("--fake-latency-ms", type=float, help="fake provider latency for in-process replays")
+    parser.add_argument("--report", help="write the report JSON to this path")
+    parser.add_argument("--baseline", help="compare against a stored report and fail on regressions")
+    parser.add_argument("--save-baseline", help="store this run's report as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+
+    events = load_events(args.source)
+    if not events:
+        print(f"No replayable requests found in {args.source}", file=sys.stderr)
+        return 1
+    if args.max_gap is not None:
+        events = cap_gaps(events, args.max_gap)
+
+    if args.target:
+        def make_client(index: int) -> HttpClient:
+            return HttpClient(args.target, args.timeout)
+        results, wall_time = run_replay(events, make_client, args.speed)
+    else:
+        # The app logs to stdout from import onwards and prints every
+        # request; keep stdout for the JSON report alone.
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results, wall_time = run_replay(events, _in_process_client_factory(args.fake_latency_ms), args.speed)
+
+    report = summarize(results, wall_time)
+    report['source'] = args.source
+    report['speed'] = args.speed
+    report['max_gap_s'] = args.max_gap
+    report['target'] = args.target or 'in-process (fake provider)'
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report['regressions'] = regressions
+        exit_code = 1 if regressions else 0
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+QUESTION_PREFIX_LENGTH = 50
+
+class RequestCapture:
+    """Appends one JSON line per generate_answer request for later replay.
+
+    Disabled when ``path`` is empty. Records carry the arrival timestamp and
+    session id so ``modules.replay`` can reproduce the original traffic shape.
+    Questions are cut to the same 50 character prefix the app logs, so the
+    capture never retains more student content than homework_ai.log.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def record(self, arrived_at: datetime, session_id: Optional[str], question: str,
+               status: int, latency_ms: float, error: bool = False) -> None:
+        if not self.enabled:
+            return
+        entry: Dict[str, Any] = {
+            'timestamp': arrived_at.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'session_id': session_id,
+            'question': str(question)[:QUESTION_PREFIX_LENGTH],
+            'status': status,
+            'error': error,
+            'latency_ms': round(latency_ms, 3)
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        try:
+            with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        except OSError as e:
+            logger.warning("Failed to write request capture", path=self.path, error=str(e))
@@ -0,0 +1,179 @@
+import threading
+import time
+import pytest
+from flask import Flask
+from handlers.routes import configure_routes
+from modules import admission as admission_module
+from modules.admission import AdmissionController, AdmissionRejected, FOLLOW_UP, NEW_SESSION
+from modules.config import Config
+from modules.rate_limiter import limiter
+
+def _controller(**overrides) -> AdmissionController:
+    settings = dict(
+        admission_max_queue=10,
+        admission_queue_timeout=2,
+        admission_initial_limit=1,
+        admission_min_limit=1,
+        admission_max_limit=1,
+        admission_latency_target=1
+    )
+    settings.update(overrides)
+    return AdmissionController(Config(**settings))
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+def _start_waiter(controller, priority, outcomes, name):
+    def run():
+        try:
+            with controller.admit(priority):
+                outcomes.append(name)
+        except AdmissionRejected as e:
+            outcomes.append(f"{name}:{e.reason}")
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+def test_follow_ups_are_dequeued_before_new_sessions():
+    controller = _controller()
+    order = []
+    with controller.admit(NEW_SESSION):
+        threads = [_start_waiter(controller, NEW_SESSION, order, "new")]
+        _wait_for(lambda: controller.stats()['queue_depth'] == 1)
+        threads.append(_start_waiter(controller, FOLLOW_UP, order, "follow_up"))
+        _wait_for(lambda: controller.stats()['queue_depth'] == 2)
+        assert controller.stats()['queued'] == {'follow_up': 1, 'new_session': 1}
+    for thread in threads:
+        thread.join()
+    assert order == ["follow_up", "new"]
+
+def test_full_queue_displaces_newest_new_session():
+    controller = _controller(admission_max_queue=2)
+    outcomes = []
+    with controller.admit(NEW_SESSION):
+        threads = [_start_waiter(controller, NEW_SESSION, outcomes, "older")]
+        _wait_for(lambda: controller.stats()['queue_depth'] == 1)
+        threads.append(_start_waiter(controller, NEW_SESSION, outcomes, "newer"))
+        _wait_for(lambda: controller.stats()['queue_depth'] == 2)
+        threads.append(_start_waiter(controller, FOLLOW_UP, outcomes, "follow_up"))
+        _wait_for(lambda: "newer:displaced" in outcomes)
+        assert controller.stats()['queued'] == {'follow_up': 1, 'new_session': 1}
+    for thread in threads:
+        thread.join()
+    assert outcomes == ["newer:displaced", "follow_up", "older"]
+    assert controller.stats()['shed_by_reason']['displaced'] == 1
+
+def test_full_queue_rejects_equal_or_lower_priority():
+    controller = _controller(admission_max_queue=1)
+    outcomes = []
+    with controller.admit(NEW_SESSION):
+        thread = _start_waiter(controller, FOLLOW_UP, outcomes, "queued")
+        _wait_for(lambda: controller.stats()['queue_depth'] == 1)
+        for priority in (NEW_SESSION, FOLLOW_UP):
+            with pytest.raises(AdmissionRejected) as excinfo:
+                with controller.admit(priority):
+                    pass
+            assert excinfo.value.reason == 'queue_full'
+            assert excinfo.value.retry_after >= 1
+    thread.join()
+    assert outcomes == ["queued"]
+    assert controller.stats()['shed_by_reason']['queue_full'] == 2
+
+def test_waiters_are_shed_after_queue_timeout():
+    controller = _controller(admission_queue_timeout=0.05)
+    with controller.admit(NEW_SESSION):
+        started = time.monotonic()
+        with pytest.raises(AdmissionRejected) as excinfo:
+            with controller.admit(FOLLOW_UP):
+                pass
+        assert time.monotonic() - started >= 0.05
+    assert excinfo.value.reason == 'timeout'
+    stats = controller.stats()
+    assert stats['shed_by_reason']['timeout'] == 1
+    assert stats['queue_depth'] == 0
+    assert stats['admitted'] == 1
+
+def _complete(controller, clock, latency, failed=False):
+    with controller.admit(NEW_SESSION) as slot:
+        clock.now += latency
+        slot.failed = failed
+
+def test_slow_or_failed_completions_decrease_limit_once_per_latency(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission_module, "time", clock)
+    controller = _controller(admission_initial_limit=8, admission_max_limit=8)
+
+    _complete(controller, clock, 2)
+    assert controller.stats()['limit'] == 6
+    # Still inside the cooldown of one observed latency since the last cut.
+    _complete(controller, clock, 1.5)
+    assert controller.stats()['limit'] == 6
+
+    clock.now += 5
+    _complete(controller, clock, 0.1, failed=True)
+    assert controller.stats()['limit'] == 4.5
+    assert controller.stats()['failed'] == 1
+
+def test_decrease_stops_at_min_limit(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission_module, "time", clock)
+    controller = _controller(admission_initial_limit=2, admission_min_limit=2, admission_max_limit=4)
+    for _ in range(3):
+        clock.now += 10
+        _complete(controller, clock, 5)
+    assert controller.stats()['limit'] == 2
+
+def test_fast_completions_increase_limit_up_to_max(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission_module, "time", clock)
+    controller = _controller(admission_initial_limit=1, admission_max_limit=3)
+
+    _complete(controller, clock, 0.1)
+    assert controller.stats()['limit'] == 2
+    _complete(controller, clock, 0.1)
+    assert controller.stats()['limit'] == 2.5
+    for _ in range(10):
+        _complete(controller, clock, 0.1)
+    assert controller.stats()['limit'] == 3
+
+def test_generate_answer_sheds_with_retry_after():
+    app = Flask(__name__)
+    limiter.init_app(app)
+    configure_routes(app, Config(
+        ai_provider='fake',
+        fake_provider_latency_ms=300,
+        request_capture_path='',
+        admission_max_queue=0,
+        admission_initial_limit=1,
+        admission_min_limit=1,
+        admission_max_limit=1
+    ))
+    client = app.test_client()
+    environ = {'REMOTE_ADDR': '10.0.27.1'}
+    responses = []
+    slow = threading.Thread(target=lambda: responses.append(
+        app.test_client().post("/api/generate_answer", json={"question": "first"}, environ_base=environ)))
+    slow.start()
+    _wait_for(lambda: client.get("/api/health").get_json()['admission']['in_flight'] == 1)
+
+    shed = client.post("/api/generate_answer", json={"question": "second"}, environ_base=environ)
+    slow.join()
+
+    assert shed.status_code == 503
+    assert int(shed.headers['Retry-After']) >= 1
+    assert responses[0].status_code == 200
+    health = client.get("/api/health").get_json()
+    assert health['admission']['shed'] == 1
+    assert health['admission']['shed_by_reason']['queue_full'] == 1
+    assert health['admission']['queue_depth'] == 0
+    assert health['admission']['admitted'] == 1
@@ -0,0 +1,176 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from modules.ai_provider import HomeworkAI
+from modules.client_pool import ClientPool, PoolTimeout
+from modules.config import Config
+from modules.session_manager import SessionManager
+
+def _counting_factory():
+    created = []
+
+    def factory():
+        client = object()
+        created.append(client)
+        return client
+    return factory, created
+
+def test_never_opens_more_than_size_under_concurrency():
+    factory, created = _counting_factory()
+    pool = ClientPool(factory, size=3, timeout=5)
+    lock = threading.Lock()
+    in_use = [0, 0]
+
+    def worker():
+        for _ in range(5):
+            with pool.acquire():
+                with lock:
+                    in_use[0] += 1
+                    in_use[1] = max(in_use[1], in_use[0])
+                time.sleep(0.005)
+                with lock:
+                    in_use[0] -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = pool.stats()
+    assert len(created) <= 3
+    assert in_use[1] <= 3
+    assert stats['open'] == len(created)
+    assert stats['acquisitions'] == 50
+    assert stats['reuses'] == 50 - len(created)
+    assert stats['in_use'] == 0
+
+def test_reuses_most_recently_used_client_first():
+    factory, created = _counting_factory()
+    pool = ClientPool(factory, size=2, timeout=1)
+    with pool.acquire() as first:
+        with pool.acquire() as second:
+            pass
+    # ``first`` was returned last, so it is the warmest client.
+    with pool.acquire() as client:
+        assert client is first
+    with pool.acquire() as client:
+        assert client is first
+    assert second is not first
+    stats = pool.stats()
+    assert stats['open'] == 2
+    assert stats['reuses'] == 2
+    assert stats['reuse_rate'] == 0.5
+
+def test_timeout_raises_and_is_counted():
+    factory, _ = _counting_factory()
+    pool = ClientPool(factory, size=1, timeout=0.05)
+    with pool.acquire():
+        with pytest.raises(PoolTimeout):
+            with pool.acquire():
+                pass
+    stats = pool.stats()
+    assert stats['timeouts'] == 1
+    assert stats['waits'] == 0
+    assert stats['acquisitions'] == 1
+
+def test_factory_exception_releases_reserved_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("connect failed")
+        return object()
+
+    pool = ClientPool(factory, size=1, timeout=0.05)
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            pass
+    assert pool.stats()['open'] == 0
+    with pool.acquire():
+        assert pool.stats()['open'] == 1
+
+def test_close_closes_idle_clients_and_rejects_checkout():
+    factory, created = _counting_factory()
+    closed = []
+    pool = ClientPool(factory, size=2, timeout=1, closer=closed.append)
+    with pool.acquire():
+        pass
+    pool.close()
+    assert closed == created
+    assert pool.stats()['open'] == 0
+    with pytest.raises(PoolTimeout):
+        with pool.acquire():
+            pass
+
+ANSWER = {
+    "greeting": "Hi!",
+    "question_type": "math",
+    "solution_steps": ["2 + 2 = 4"],
+    "final_answer": "4",
+    "difficulty_level": "Easy",
+    "closing_note": "Keep going!"
+}
+
+class _MockGemini(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.connections.add(self.client_address)
+        time.sleep(0.02)
+        body = json.dumps({"candidates": [{
+            "content": {"role": "model", "parts": [{"text": json.dumps(ANSWER)}]},
+            "finishReason": "STOP"
+        }]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def mock_gemini():
+    _MockGemini.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockGemini)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_pooled_clients_keep_connections_alive(mock_gemini):
+    config = Config(
+        google_api_key="test-key",
+        upstream_transport="rest",
+        upstream_endpoint=f"http://127.0.0.1:{mock_gemini.server_port}",
+        upstream_pool_size=2
+    )
+    homework_ai = HomeworkAI(config, SessionManager(config))
+
+    def ask():
+        session_id = homework_ai.start_session()
+        for _ in range(3):
+            response, upstream_failed = homework_ai.generate_response(session_id, "What is 2 + 2?")
+            assert response["final_answer"] == "4"
+            assert not upstream_failed
+
+    threads = [threading.Thread(target=ask) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = homework_ai.pool_stats()
+    homework_ai.close()
+    assert stats['acquisitions'] == 9
+    assert 1 <= stats['open'] <= 2
+    assert len(_MockGemini.connections) == stats['open']
+    assert stats['reuse_rate'] > 0
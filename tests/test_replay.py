@@ -0,0 +1,138 @@
+import json
+import pytest
+from flask import Flask
+from handlers.routes import configure_routes
+from modules.config import Config
+from modules.rate_limiter import limiter
+from modules.replay import (
+    InProcessClient, ReplayEvent, ReplayResult, cap_gaps, compare, load_events, run_replay, summarize
+)
+
+LOG_LINES = [
+    '{"event": "HomeworkAI initialized successfully", "timestamp": "2025-05-11T12:00:00.000000Z", "level": "info"}',
+    ' * Running on http://127.0.0.1:5000',
+    '{"event": "Processing question", "question": "follow up", "request_id": "r2", '
+    '"session_id": "a", "timestamp": "2025-05-11T12:00:03.500000Z", "level": "info"}',
+    '{"event": "Fetching chat history", "request_id": "r0", "session_id": "a", '
+    '"timestamp": "2025-05-11T12:00:01.000000Z", "level": "info"}',
+    '{"event": "Processing question", "question": "What is 2 + 2?", "request_id": "r1", '
+    '"session_id": "a", "timestamp": "2025-05-11T12:00:01.000000Z", "level": "info"}',
+    '{"event": "Processing question", "question": "Why is the sky blue?", "request_id": "r3", '
+    '"session_id": "b", "timestamp": "2025-05-11T12:00:02.000000Z", "level": "info"}',
+    '127.0.0.1 - - [11/May/2025 19:03:28] "GET /api/chat_history/null HTTP/1.1" 404 -',
+]
+
+CAPTURE_RECORDS = [
+    {"timestamp": "2026-01-01T00:00:00Z", "session_id": "s1", "question": "q1", "status": 200},
+    {"timestamp": "2026-01-01T00:00:01Z", "session_id": None, "question": "shed", "status": 503},
+    {"timestamp": "2026-01-01T00:00:02Z", "session_id": "s1", "question": "q2", "status": 200},
+    {"timestamp": "2026-01-01T00:00:03Z", "question": "no session", "status": 503},
+]
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "homework_ai.log"
+    path.write_text("\n".join(LOG_LINES) + "\n", encoding="utf-8")
+    return str(path)
+
+@pytest.fixture
+def capture_file(tmp_path):
+    path = tmp_path / "capture.jsonl"
+    path.write_text("".join(json.dumps(record) + "\n" for record in CAPTURE_RECORDS), encoding="utf-8")
+    return str(path)
+
+def test_load_events_reads_only_processing_question_events(log_file):
+    events = load_events(log_file)
+    assert [(e.offset, e.session_key, e.question) for e in events] == [
+        (0.0, "a", "What is 2 + 2?"),
+        (1.0, "b", "Why is the sky blue?"),
+        (2.5, "a", "follow up"),
+    ]
+
+def test_load_events_keys_session_less_records_by_line(capture_file):
+    events = load_events(capture_file)
+    assert [e.session_key for e in events] == ["s1", "anonymous-1", "s1", "anonymous-3"]
+    assert [e.offset for e in events] == [0.0, 1.0, 2.0, 3.0]
+
+def test_cap_gaps_shortens_only_long_gaps():
+    events = [ReplayEvent(offset, "s", "q") for offset in (0.0, 0.5, 10.5, 11.0, 100.0)]
+    assert [e.offset for e in cap_gaps(events, 2.0)] == [0.0, 0.5, 2.5, 3.0, 5.0]
+
+def _result(latency_ms, status=200, error=False, session_key="s"):
+    return ReplayResult(session_key, 0.0, 0.0, latency_ms / 1000, status, error)
+
+def test_summarize_percentiles_and_errors():
+    results = [_result(ms) for ms in range(1, 101)]
+    results[0] = _result(1, status=503, error=True)
+    results[1] = _result(2, error=True)
+    report = summarize(results, wall_time=10.0)
+    assert report['requests'] == 100
+    assert report['throughput_rps'] == 10.0
+    assert report['p50_ms'] == 50.0
+    assert report['p90_ms'] == 90.0
+    assert report['p95_ms'] == 95.0
+    assert report['p99_ms'] == 99.0
+    assert report['max_ms'] == 100.0
+    assert report['statuses'] == {'200': 99, '503': 1}
+    assert report['shed'] == 1
+    assert report['errors'] == 2
+    assert report['error_rate'] == 0.02
+
+def test_summarize_single_result_uses_it_for_every_percentile():
+    report = summarize([_result(42)], wall_time=1.0)
+    assert report['p50_ms'] == report['p99_ms'] == report['max_ms'] == 42.0
+
+BASELINE = {'p50_ms': 100.0, 'p95_ms': 200.0, 'p99_ms': 300.0, 'throughput_rps': 10.0, 'error_rate': 0.0}
+
+def _report(**overrides):
+    report = dict(BASELINE)
+    report.update(overrides)
+    return report
+
+def test_compare_allows_exactly_the_tolerance():
+    report = _report(p50_ms=120.0, p95_ms=240.0, p99_ms=360.0, throughput_rps=8.0, error_rate=0.01)
+    assert compare(report, BASELINE, tolerance=0.2) == []
+
+def test_compare_flags_anything_past_the_tolerance():
+    report = _report(p50_ms=120.01, throughput_rps=7.99, error_rate=0.0101)
+    regressions = compare(report, BASELINE, tolerance=0.2)
+    assert len(regressions) == 3
+    assert regressions[0].startswith("p50_ms")
+    assert regressions[1].startswith("throughput_rps")
+    assert regressions[2].startswith("error_rate")
+
+def test_compare_skips_metrics_missing_from_baseline():
+    report = _report(p50_ms=1000.0, throughput_rps=0.1)
+    assert compare(report, {}, tolerance=0.2) == []
+    assert compare(_report(error_rate=0.5), {}, tolerance=0.2) != []
+
+class RecordingClient(InProcessClient):
+    def __init__(self, app, index, calls):
+        super().__init__(app, index)
+        self.calls = calls
+
+    def post(self, payload):
+        status, body = super().post(payload)
+        self.calls.append((dict(payload), status, body))
+        return status, body
+
+def test_in_process_replay_keeps_session_continuity(log_file):
+    app = Flask(__name__)
+    limiter.init_app(app)
+    configure_routes(app, Config(ai_provider='fake', fake_provider_latency_ms=0, request_capture_path=''))
+    calls = []
+    events = load_events(log_file)
+
+    results, wall_time = run_replay(events, lambda index: RecordingClient(app, index, calls), speed=50)
+
+    assert len(results) == 3
+    assert all(r.status == 200 and not r.error for r in results)
+    by_question = {payload['question']: (payload, body) for payload, _, body in calls}
+    first_payload, first_body = by_question["What is 2 + 2?"]
+    follow_up_payload, follow_up_body = by_question["follow up"]
+    other_payload, other_body = by_question["Why is the sky blue?"]
+    assert 'session_id' not in first_payload
+    assert 'session_id' not in other_payload
+    assert follow_up_payload['session_id'] == first_body['session_id']
+    assert follow_up_body['session_id'] == first_body['session_id']
+    assert other_body['session_id'] != first_body['session_id']